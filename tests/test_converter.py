@@ -0,0 +1,37 @@
+from unittest import mock
+
+import pandas as pd
+
+from utils import converter
+
+AREA = {'x': 0, 'y': 0, 'width': 1, 'height': 1, 'page': 1}
+
+
+def fake_read_pdf(pdf_path, **options):
+    """Mimic tabula: numeric-looking columns become floats unless a dtype is given"""
+    pandas_options = options.get('pandas_options', {})
+    table = pd.DataFrame([['26 APR', 'SALARY', '100.00']], dtype=pandas_options.get('dtype'))
+    if 'dtype' not in pandas_options:
+        table[2] = table[2].astype(float)
+    return [table]
+
+
+def test_area_text_keeps_float_amount_text():
+    with mock.patch.object(converter, 'start_tabula_jvm'), \
+            mock.patch.object(converter.tabula, 'read_pdf', side_effect=fake_read_pdf):
+        text = converter.extract_text_from_area('statement.pdf', AREA)
+
+    assert text == '26 APR SALARY 100.00\n'
+    transactions = converter.parse_text_to_transactions(text)
+    assert transactions[0]['Deposits ($)'] == '100.00'
+
+
+def test_parse_date_series_rejects_non_dates():
+    dates = pd.Series(['26 APR', 'SALARY', None, '２６ APR', '31 APR', '30 FEB'])
+
+    parsed = converter.parse_date_series(dates, 2024)
+
+    assert parsed.tolist() == [
+        pd.Timestamp(2024, 4, 26), pd.NaT, pd.NaT, pd.Timestamp(2024, 4, 26),
+        pd.Timestamp(2024, 4, 30), pd.NaT,
+    ]
@@ -1,192 +1,165 @@
+import csv
+import functools
 import logging
 import tempfile
+import threading
 import pandas as pd
 import tabula
+import jpype
 import os
 from datetime import datetime
-from openpyxl.styles import Font, PatternFill, Alignment
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, NamedStyle
 from openpyxl.utils import get_column_letter
-from .image_processor import is_image_based_pdf, process_image_based_pdf
+from .image_processor import process_image_based_pdf
+from collections import defaultdict
+from dataclasses import dataclass
 from typing import Dict, List
 import PyPDF2
 import re
 
+# Column order of the exported transaction table
+TRANSACTION_COLUMNS = ['Date', 'Transaction Details', 'Withdrawals ($)', 'Deposits ($)', 'Balance ($)']
+AMOUNT_COLUMNS = TRANSACTION_COLUMNS[2:]
+
+# Month abbreviations as they appear in statement dates (e.g. "26 APR")
+_MONTHS = {
+    'JAN': 1, 'FEB': 2, 'MAR': 3, 'APR': 4, 'MAY': 5, 'JUN': 6,
+    'JUL': 7, 'AUG': 8, 'SEP': 9, 'OCT': 10, 'NOV': 11, 'DEC': 12,
+}
+_DATE_RE = re.compile(r'(\d{1,2})\s+([A-Z]{3})\S*')
+_NON_DATE_RE = re.compile(r'TOTALS|BALANCE|OPENING')
+
+# Header/footer rows that are not transactions
+_SKIP_RE = re.compile(r'closing|balance brought|balance carried|total', re.IGNORECASE)
+_OPENING_RE = re.compile(r'opening balance', re.IGNORECASE)
+
+# An amount such as "$1,234.50", "-12.00" or "(12.00)", parsed in a single match
+_AMOUNT_RE = re.compile(
+    r'\s*(?P<open>\()?\s*(?:(?P<minus>-\s*\$?|\$\s*-)|\$)?\s*'
+    r'(?P<number>\d[\d,]*(?:\.\d*)?|\.\d+)\s*(?(open)\))\s*'
+)
+# The same pattern anchored at both ends, for column-wise matching with str.extract
+_AMOUNT_FULL_RE = re.compile(r'\A(?:' + _AMOUNT_RE.pattern + r')\Z')
+
+# Dates and amounts in text extracted from a selected area
+_TEXT_DATE_RE = re.compile(r'(\d{1,2})\s*(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)', re.IGNORECASE)
+_TEXT_AMOUNT_RE = re.compile(r'\$?\s*-?\d+(?:,\d{3})*(?:\.\d{2})?')
+
+# Options for the JVM that runs tabula. It is started once per process and shared by
+# every read, so these are the only Java options that take effect.
+TABULA_JAVA_OPTIONS = [
+    '-Djava.awt.headless=true',
+    '-Dfile.encoding=UTF8',
+    # Enough heap for multi-page statements without frequent full GCs
+    '-Xmx512m',
+    # tabula's own silent option only applies when tabula starts the JVM itself
+    '-Dorg.slf4j.simpleLogger.defaultLogLevel=error',
+]
+_TABULA_JVM_LOCK = threading.Lock()
+
+# PDFs with less text than this on their first pages are treated as scanned images
+IMAGE_PDF_SAMPLE_PAGES = 3
+IMAGE_PDF_TEXT_THRESHOLD = 100
+
+# Write buffer for CSV output; larger than the default so big statements need fewer writes
+CSV_BUFFER_SIZE = 1 << 16
+
 def clean_amount(amount_str):
     """Clean and format amount strings"""
     if pd.isna(amount_str):
         return ''
-    # Remove currency symbols and cleanup
-    amount_str = str(amount_str).replace('$', '').replace(',', '').strip()
-    # Handle brackets for negative numbers
-    if '(' in amount_str and ')' in amount_str:
-        amount_str = '-' + amount_str.replace('(', '').replace(')', '')
-    try:
-        # Try to convert to float to validate
-        float(amount_str)
-        return amount_str
-    except ValueError:
+    match = _AMOUNT_RE.fullmatch(str(amount_str))
+    if not match:
         return ''
-
-def parse_date(date_str):
-    """Parse date string from bank statement format"""
-    try:
-        if not date_str or pd.isna(date_str):
-            return None
-
-        date_str = str(date_str).strip().upper()
-
-        # Skip rows that aren't dates
-        if any(word in date_str for word in ['TOTALS', 'BALANCE', 'OPENING']):
-            return None
-
-        # Handle day and month format (e.g., "26 APR")
-        parts = date_str.split()
-        if len(parts) == 2:
-            try:
-                day = int(parts[0])
-                month = parts[1][:3]  # Take first 3 chars of month
-                current_year = datetime.now().year
-                # Handle special case for dates like "31 APR"
-                if month == 'APR' and day == 31:
-                    day = 30
-                date_str = f"{day:02d} {month} {current_year}"
-                parsed_date = datetime.strptime(date_str, '%d %b %Y')
-                return parsed_date
-            except (ValueError, IndexError) as e:
-                logging.debug(f"Date parse error: {e} for {date_str}")
-                return None
-
-        return None
-    except Exception as e:
-        logging.debug(f"Failed to parse date: {date_str}, error: {str(e)}")
-        return None
-
-def process_transaction_rows(table, page_idx):
-    """Process rows and handle multi-line transactions"""
-    processed_data = []
-    current_buffer = []
-
-    # Clean the table
-    table = table.dropna(how='all').reset_index(drop=True)
-
-    logging.debug(f"Starting to process table on page {page_idx} with {len(table)} rows")
-    logging.debug(f"Table columns: {table.columns}")
-    logging.debug(f"First few rows: {table.head()}")
-
-    def process_buffer():
-        if not current_buffer:
-            return None
-
-        logging.debug(f"Processing buffer with {len(current_buffer)} rows: {current_buffer}")
-
-        # Get date from first row
-        date = parse_date(current_buffer[0][0])
-        if not date:
-            logging.debug(f"Failed to parse date from: {current_buffer[0][0]}")
-            return None
-
-        # Initialize transaction
-        transaction = {
-            'Date': date.strftime('%d %b'),
-            'Transaction Details': '',
-            'Withdrawals ($)': '',
-            'Deposits ($)': '',
-            'Balance ($)': '',
-            '_page_idx': page_idx,
-            '_row_idx': int(current_buffer[0][-1]),
-        }
-
-        # Process all rows
-        details = []
-        for row in current_buffer:
-            # Add description
-            if row[1].strip():
-                details.append(row[1].strip())
-                logging.debug(f"Added description: {row[1].strip()}")
-
-            # Process amounts with detailed logging
-            withdrawal = clean_amount(row[2])
-            deposit = clean_amount(row[3])
-            balance = clean_amount(row[4]) if len(row) > 4 else ''
-
-            logging.debug(f"Processing amounts - W: {withdrawal}, D: {deposit}, B: {balance}")
-
-            # Update amounts if not already set
-            if withdrawal and not transaction['Withdrawals ($)']:
-                transaction['Withdrawals ($)'] = withdrawal
-                logging.debug(f"Set withdrawal: {withdrawal}")
-            if deposit and not transaction['Deposits ($)']:
-                transaction['Deposits ($)'] = deposit
-                logging.debug(f"Set deposit: {deposit}")
-            if balance and not transaction['Balance ($)']:
-                transaction['Balance ($)'] = balance
-                logging.debug(f"Set balance: {balance}")
-
-        # Join details
-        transaction['Transaction Details'] = '\n'.join(filter(None, details))
-        logging.debug(f"Final transaction: {transaction}")
-        return transaction
-
-    # Process each row
-    for idx, row in table.iterrows():
-        # Clean row values and add index
-        row_values = [str(val).strip() if not pd.isna(val) else '' for val in row]
-        row_values.append(idx)
-
-        logging.debug(f"Processing row {idx}: {row_values}")
-
-        # Check for date and content
-        has_date = bool(parse_date(row_values[0]))
-        has_content = any(val.strip() for val in row_values[1:5])
-
-        logging.debug(f"Row analysis - has_date: {has_date}, has_content: {has_content}")
-
-        if has_date:
-            # Process previous buffer if exists
-            if current_buffer:
-                trans = process_buffer()
-                if trans:
-                    processed_data.append(trans)
-                current_buffer = []
-
-            # Start new buffer
-            current_buffer = [row_values]
-            logging.debug(f"Started new transaction: {row_values}")
-
-        elif current_buffer and has_content:
-            # Add to current buffer
-            current_buffer.append(row_values)
-            logging.debug(f"Added to current transaction: {row_values}")
-
-    # Process final buffer
-    if current_buffer:
-        trans = process_buffer()
-        if trans:
-            processed_data.append(trans)
-
-    # Sort by row index
-    processed_data.sort(key=lambda x: (x['_page_idx'], x['_row_idx']))
-
-    # Remove tracking fields
-    for trans in processed_data:
-        trans.pop('_page_idx', None)
-        trans.pop('_row_idx', None)
-
-    # Log results
-    logging.debug(f"Processed {len(processed_data)} transactions")
-    for idx, trans in enumerate(processed_data):
-        logging.debug(f"Transaction {idx}: {trans}")
-
-    return processed_data
+    # Brackets or a leading minus mark negative amounts
+    sign = '-' if match.group('open') or match.group('minus') else ''
+    return sign + match.group('number').replace(',', '')
+
+def clean_amount_series(amounts: pd.Series) -> pd.Series:
+    """Clean and format a whole column of amount strings at once, as clean_amount does"""
+    parts = amounts.astype(str).str.extract(_AMOUNT_FULL_RE)
+    # Brackets or a leading minus mark negative amounts
+    sign = (parts['open'].notna() | parts['minus'].notna()).map({True: '-', False: ''})
+    cleaned = sign + parts['number'].str.replace(',', '', regex=False)
+    # Cells that aren't a single amount become blank
+    return cleaned.where(parts['number'].notna() & amounts.notna(), '')
+
+def parse_date_series(dates: pd.Series, year=None) -> pd.Series:
+    """Parse a column of bank statement dates such as "26 APR"; unparseable cells become NaT"""
+    year = year or datetime.now().year
+    normalized = dates.astype(str).str.strip().str.upper()
+
+    # Dates start with the day, so descriptions and headers are rejected before any regex
+    normalized = normalized[dates.notna() & normalized.str[:1].str.isdigit()]
+
+    # Only cells shaped like "26 APR" that aren't totals/balance rows are dates
+    is_candidate = normalized.str.fullmatch(_DATE_RE) & ~normalized.str.contains(_NON_DATE_RE)
+    parts = normalized[is_candidate].str.extract(_DATE_RE).reindex(dates.index)
+    # \d also matches non-ASCII digits, which int() reads but to_numeric rejects
+    day = parts[0].dropna().map(int).reindex(parts.index).astype(float)
+    month = parts[1].map(_MONTHS)
+
+    # Handle special case for dates like "31 APR"
+    day = day.mask((month == 4) & (day == 31), 30)
+
+    # Impossible dates such as "30 FEB" become NaT
+    return pd.to_datetime(
+        pd.DataFrame({'year': year, 'month': month, 'day': day}), errors='coerce'
+    )
+
+def transaction_rows_frame(table, page_idx) -> pd.DataFrame:
+    """Process rows and handle multi-line transactions, returning one column per field"""
+    year = datetime.now().year
+
+    # Fully empty rows need no dropping: they carry no date, details or amounts
+    logging.debug("Starting to process table on page %s with %s rows", page_idx, len(table))
+    logging.debug("Table columns: %s", table.columns)
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        logging.debug("First few rows: %s", table.head())
+
+    row_dates = parse_date_series(table.iloc[:, 0], year)
+    has_date = row_dates.notna()
+
+    # Every dated row starts a transaction and the rows below it continue it;
+    # rows above the first date belong to no transaction (group 0)
+    group_key = has_date.cumsum()
+    in_transaction = group_key > 0
+
+    transactions = pd.DataFrame(
+        {'Date': row_dates[has_date].dt.strftime('%d %b').to_numpy()},
+        index=group_key[has_date].to_numpy(),
+    )
+
+    # Join the non-blank description lines of each transaction
+    details = table.iloc[:, 1]
+    details = details.where(details.notna(), '').astype(str).str.strip()
+    keep = details.ne('') & in_transaction
+    transactions['Transaction Details'] = details[keep].groupby(group_key[keep].to_numpy()).agg('\n'.join)
+
+    # Keep the first amount found in each column of a transaction
+    for position, column in enumerate(AMOUNT_COLUMNS, 2):
+        if position >= table.shape[1]:
+            continue
+        amounts = clean_amount_series(table.iloc[:, position])
+        keep = amounts.ne('') & in_transaction
+        transactions[column] = amounts[keep].groupby(group_key[keep].to_numpy()).first()
+
+    transactions = transactions.reindex(columns=TRANSACTION_COLUMNS).fillna('').reset_index(drop=True)
+    logging.debug("Processed %s transactions", len(transactions))
+    return transactions
 
 def is_valid_transaction(transaction: Dict) -> bool:
     """Validate transaction data"""
     try:
         # Allow opening balance entries
-        if transaction.get('is_opening_balance') or (
-            'OPENING BALANCE' in transaction['Transaction Details'].upper() and
-            transaction['Balance ($)']
-        ):
+        if transaction.get('is_opening_balance'):
+            return True
+
+        details = transaction['Transaction Details']
+        balance = transaction['Balance ($)']
+        if balance and _OPENING_RE.search(details):
             return True
 
         # Must have date and some content
@@ -194,138 +167,103 @@ def is_valid_transaction(transaction: Dict) -> bool:
             return False
 
         # Must have some details or amounts
-        has_content = any([
-            transaction['Transaction Details'],
-            transaction['Withdrawals ($)'],
-            transaction['Deposits ($)'],
-            transaction['Balance ($)']
-        ])
+        has_content = (
+            details or
+            transaction['Withdrawals ($)'] or
+            transaction['Deposits ($)'] or
+            balance
+        )
         if not has_content:
             return False
 
         # Skip other header/footer rows
-        skip_words = ['closing', 'balance brought', 'balance carried', 'total']
-        details_lower = transaction['Transaction Details'].lower()
-        if any(word in details_lower for word in skip_words):
+        if _SKIP_RE.search(details):
             return False
 
         return True
     except Exception:
         return False
 
-def detect_bank_statement_type(pdf_path: str) -> str:
-    """Detect the type of bank statement based on content analysis"""
-    try:
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            first_page_text = pdf_reader.pages[0].extract_text().upper()
-
-            if 'NATIONWIDE' in first_page_text:
-                return 'nationwide'
-            return 'generic'
-    except Exception as e:
-        logging.error(f"Error detecting bank statement type: {str(e)}")
-        return 'generic'
-
-def process_nationwide_statement(table):
-    """Process Nationwide bank statement specific format"""
-    try:
-        processed_data = []
-        logging.debug(f"Processing Nationwide statement table with shape: {table.shape}")
-        logging.debug(f"Table columns: {table.columns.tolist()}")
-        logging.debug(f"First few rows:\n{table.head()}")
-
-        # Clean and standardize the table
-        table = table.dropna(how='all').reset_index(drop=True)
-
-        # Find the header row
-        header_row_idx = None
-        for idx, row in table.iterrows():
-            row_values = [str(val).strip().upper() for val in row if not pd.isna(val)]
-            row_text = ' '.join(row_values)
-            logging.debug(f"Checking row {idx}: {row_text}")
-
-            if any(keyword in row_text for keyword in ['DATE', 'DESCRIPTION', 'PAYMENTS', 'RECEIPTS', 'BALANCE']):
-                header_row_idx = idx
-                logging.debug(f"Found header row at index {idx}")
+@dataclass
+class PdfMeta:
+    """PDF details shared by the extraction helpers so the file is parsed once"""
+    reader: PyPDF2.PdfReader
+    num_pages: int
+    width: float
+    height: float
+
+    @functools.cached_property
+    def leading_text_length(self) -> int:
+        """Length of the text layer on the first few pages, counted until it reaches the threshold"""
+        length = 0
+        for page in self.reader.pages[:IMAGE_PDF_SAMPLE_PAGES]:
+            length += len((page.extract_text() or '').strip())
+            if length >= IMAGE_PDF_TEXT_THRESHOLD:
                 break
-
-        if header_row_idx is None:
-            logging.error("Could not find header row in table")
-            return []
-
-        # Set the header and clean the table
-        table.columns = table.iloc[header_row_idx]
-        table = table.iloc[header_row_idx + 1:].reset_index(drop=True)
-
-        # Map columns to standardized names
-        column_mapping = {}
-        for col in table.columns:
-            col_str = str(col).upper()
-            if 'DATE' in col_str:
-                column_mapping[col] = 'Date'
-            elif any(x in col_str for x in ['DESCRIPTION', 'DETAILS', 'TRANSACTION']):
-                column_mapping[col] = 'Description'
-            elif any(x in col_str for x in ['PAYMENT', 'OUT', 'DEBIT', 'WITHDRAWALS']):
-                column_mapping[col] = 'Withdrawals'
-            elif any(x in col_str for x in ['RECEIPT', 'IN', 'CREDIT', 'DEPOSITS']):
-                column_mapping[col] = 'Deposits'
-            elif 'BALANCE' in col_str:
-                column_mapping[col] = 'Balance'
-
-        logging.debug(f"Column mapping: {column_mapping}")
-
-        # Rename columns using the mapping
-        table = table.rename(columns=column_mapping)
-        required_columns = ['Date', 'Description', 'Withdrawals', 'Deposits', 'Balance']
-
-        # Verify we have all required columns
-        missing_columns = [col for col in required_columns if col not in table.columns]
-        if missing_columns:
-            logging.error(f"Missing required columns: {missing_columns}")
-            return []
-
-        # Process each row
-        for idx, row in table.iterrows():
-            try:
-                # Skip rows without any transaction data
-                if row.isna().all():
-                    continue
-
-                # Clean and format the data
-                date = str(row['Date']).strip()
-                details = str(row['Description']).strip()
-                withdrawal = clean_amount(str(row['Withdrawals']))
-                deposit = clean_amount(str(row['Deposits']))
-                balance = clean_amount(str(row['Balance']))
-
-                # Skip non-transaction rows
-                if not date or not details:
-                    continue
-
-                # Create transaction record
-                transaction = {
-                    'Date': date,
-                    'Transaction Details': details,
-                    'Withdrawals ($)': withdrawal,
-                    'Deposits ($)': deposit,
-                    'Balance ($)': balance
-                }
-
-                if is_valid_transaction(transaction):
-                    processed_data.append(transaction)
-                    logging.debug(f"Added transaction: {transaction}")
-
-            except Exception as e:
-                logging.error(f"Error processing row {idx}: {str(e)}")
-                continue
-
-        logging.info(f"Successfully processed {len(processed_data)} transactions")
-        return processed_data
-
-    except Exception as e:
-        logging.error(f"Error processing Nationwide statement: {str(e)}")
-        return []
+        return length
+
+def load_pdf_meta(pdf_path: str) -> PdfMeta:
+    """Parse the PDF once with PyPDF2 and collect page count and dimensions"""
+    # PdfReader buffers the file in memory when given a path, so pages stay readable later
+    pdf_reader = PyPDF2.PdfReader(pdf_path)
+    first_page = pdf_reader.pages[0]
+    return PdfMeta(
+        reader=pdf_reader,
+        num_pages=len(pdf_reader.pages),
+        width=float(first_page.mediabox.width),
+        height=float(first_page.mediabox.height),
+    )
+
+def valid_transaction_mask(transactions: pd.DataFrame) -> pd.Series:
+    """Vectorized is_valid_transaction over a DataFrame of transactions"""
+    details = transactions['Transaction Details']
+    balance = transactions['Balance ($)']
+
+    # Allow opening balance entries
+    is_opening = details.str.contains(_OPENING_RE) & balance.ne('')
+
+    # Must have date and some details or amounts
+    has_content = (
+        details.ne('') |
+        transactions['Withdrawals ($)'].ne('') |
+        transactions['Deposits ($)'].ne('') |
+        balance.ne('')
+    )
+
+    # Skip other header/footer rows
+    is_skipped = details.str.contains(_SKIP_RE)
+
+    return is_opening | (transactions['Date'].ne('') & has_content & ~is_skipped)
+
+def start_tabula_jvm():
+    """Start the in-process JVM used by tabula-py if it isn't running yet"""
+    with _TABULA_JVM_LOCK:
+        if not jpype.isJVMStarted():
+            logging.info(f"Starting tabula JVM with options: {TABULA_JAVA_OPTIONS}")
+            jpype.addClassPath(tabula.backend.jar_path())
+            jpype.startJVM(*TABULA_JAVA_OPTIONS, convertStrings=False)
+
+def read_pdf_tables(pdf_path: str, **options) -> List[pd.DataFrame]:
+    """Read tables with tabula on the shared JVM, started with TABULA_JAVA_OPTIONS"""
+    start_tabula_jvm()
+    options.setdefault('silent', True)
+    return tabula.read_pdf(pdf_path, **options)
+
+def area_to_percent(selected_area: Dict) -> List[float]:
+    """Convert a normalized selected area to tabula's [top, left, bottom, right] percentages"""
+    return [
+        selected_area['y'] * 100,  # top
+        selected_area['x'] * 100,  # left
+        (selected_area['y'] + selected_area['height']) * 100,  # bottom
+        (selected_area['x'] + selected_area['width']) * 100  # right
+    ]
+
+def group_areas_by_page(selected_areas) -> Dict[int, List[List[float]]]:
+    """Convert selected areas once and group them by page number"""
+    areas_by_page = defaultdict(list)
+    for area in selected_areas or []:
+        areas_by_page[area.get('page', 1)].append(area_to_percent(area))
+    return dict(areas_by_page)
 
 def extract_text_from_area(pdf_path: str, selected_area: Dict) -> str:
     """Extract text from a specific area of a PDF page"""
@@ -333,37 +271,44 @@ def extract_text_from_area(pdf_path: str, selected_area: Dict) -> str:
         logging.info(f"Extracting text from selected area: {selected_area}")
 
         # Use tabula to extract tables from the specific area
-        area = [
-            selected_area['y'] * 100,  # top
-            selected_area['x'] * 100,  # left
-            (selected_area['y'] + selected_area['height']) * 100,  # bottom
-            (selected_area['x'] + selected_area['width']) * 100  # right
-        ]
+        area = area_to_percent(selected_area)
 
-        tables = tabula.read_pdf(
+        tables = read_pdf_tables(
             pdf_path,
             pages=selected_area.get('page', 1),
             area=area,
             relative_area=True,
             stream=True,
             guess=False,
-            pandas_options={'header': None}
+            # Keep every cell as read: numeric columns would print 100.00 as "100.0"
+            pandas_options={'header': None, 'dtype': str}
         )
 
         if not tables:
             return ""
 
-        # Convert table to text
+        # Convert table to text: one space-joined line per row, no column padding
         text = ""
         for table in tables:
-            text += table.to_string(index=False, header=False) + "\n"
+            rows = table.fillna('').astype(str).agg(' '.join, axis=1)
+            text += '\n'.join(rows) + "\n"
 
-        logging.debug(f"Extracted text from area:\n{text}")
+        logging.debug("Extracted text from area:\n%s", text)
         return text
     except Exception as e:
         logging.error(f"Error extracting text from area: {str(e)}")
         return ""
 
+def _add_text_amounts(transaction: Dict, amounts: List[str]):
+    """Store amounts found in text: negative ones are withdrawals, the rest deposits"""
+    for amount in amounts:
+        amount = clean_amount(amount)
+        if amount:
+            if amount.startswith('-'):
+                transaction['Withdrawals ($)'] = amount[1:]
+            else:
+                transaction['Deposits ($)'] = amount
+
 def parse_text_to_transactions(text: str) -> List[Dict]:
     """Parse extracted text into transactions"""
     try:
@@ -371,19 +316,13 @@ def parse_text_to_transactions(text: str) -> List[Dict]:
         current_transaction = None
         lines = text.split('\n')
 
-        # Date pattern matching
-        date_pattern = re.compile(r'(\d{1,2})\s*(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)', re.IGNORECASE)
-        amount_pattern = re.compile(r'\$?\s*-?\d+(?:,\d{3})*(?:\.\d{2})?')
-
         for line in lines:
             line = line.strip()
             if not line:
                 continue
 
-            logging.debug(f"Processing line: {line}")
-
             # Check for date at start of line
-            date_match = date_pattern.search(line)
+            date_match = _TEXT_DATE_RE.search(line)
 
             if date_match:
                 # If we found a date, start a new transaction
@@ -400,19 +339,11 @@ def parse_text_to_transactions(text: str) -> List[Dict]:
                 }
 
                 # Look for amounts in the rest of the line
-                amounts = amount_pattern.findall(line[date_match.end():])
-                if amounts:
-                    for amount in amounts:
-                        amount = clean_amount(amount)
-                        if amount:
-                            if float(amount) < 0:
-                                current_transaction['Withdrawals ($)'] = str(abs(float(amount)))
-                            else:
-                                current_transaction['Deposits ($)'] = amount
+                _add_text_amounts(current_transaction, _TEXT_AMOUNT_RE.findall(line, date_match.end()))
 
             elif current_transaction:
                 # Continue with current transaction
-                amounts = amount_pattern.findall(line)
+                amounts = _TEXT_AMOUNT_RE.findall(line)
                 details = line
 
                 # Remove amount strings from details
@@ -423,16 +354,10 @@ def parse_text_to_transactions(text: str) -> List[Dict]:
                     current_transaction['Transaction Details'] += ' ' + details
 
                 # Process amounts
-                if amounts and not any([current_transaction['Withdrawals ($)'], 
-                                      current_transaction['Deposits ($)'], 
-                                      current_transaction['Balance ($)']]):
-                    for amount in amounts:
-                        amount = clean_amount(amount)
-                        if amount:
-                            if float(amount) < 0:
-                                current_transaction['Withdrawals ($)'] = str(abs(float(amount)))
-                            else:
-                                current_transaction['Deposits ($)'] = amount
+                if amounts and not (current_transaction['Withdrawals ($)'] or
+                                    current_transaction['Deposits ($)'] or
+                                    current_transaction['Balance ($)']):
+                    _add_text_amounts(current_transaction, amounts)
 
         # Add the last transaction
         if current_transaction and is_valid_transaction(current_transaction):
@@ -445,82 +370,94 @@ def parse_text_to_transactions(text: str) -> List[Dict]:
         logging.error(f"Error parsing text to transactions: {str(e)}")
         return []
 
-def extract_tables_from_pdf(pdf_path, selected_areas=None, java_options=None):
+def looks_like_transaction_table(table) -> bool:
+    """Check whether an extracted table has the shape of a transaction listing"""
+    if len(table.columns) < 4 or len(table) < 2:
+        return False
+    first_col = table.iloc[:, 0].dropna().astype(str).str.strip().str.upper()
+    return bool(first_col.str.fullmatch(_DATE_RE).any())
+
+def _extract_page_tables(pdf_path, page_num, page_areas=None):
+    """Extract tables from one page, trying each tabula method in turn"""
+    logging.debug("Processing page %s", page_num)
+
+    # Try extraction methods
+    methods = [
+        {'lattice': True, 'stream': False},
+        {'lattice': False, 'stream': True},
+    ]
+
+    page_tables = []
+    for method in methods:
+        try:
+            logging.debug("Trying extraction with method: %s", method)
+            tables = read_pdf_tables(
+                pdf_path,
+                pages=str(page_num),
+                multiple_tables=True,
+                guess=True,
+                area=page_areas,
+                relative_area=True,  # areas are percentages of the page
+                lattice=method['lattice'],
+                stream=method['stream'],
+                pandas_options={'header': None}
+            )
+
+            if tables:
+                logging.debug("Found %s tables with method %s", len(tables), method)
+                page_tables.extend(tables)
+
+                # Later methods only re-read the same page, so stop once we have transactions
+                if any(looks_like_transaction_table(table) for table in tables):
+                    logging.debug("Method %s found a transaction table, skipping the rest", method)
+                    break
+
+        except Exception as e:
+            logging.error(f"Error with method {method}: {str(e)}")
+            continue
+
+    return page_tables
+
+def extract_tables_from_pdf(pdf_path, areas_by_page=None, pdf_meta=None):
     """Extract tables from PDF using both lattice and stream methods"""
     try:
         logging.info(f"Starting table extraction from {pdf_path}")
 
-        # Get PDF dimensions using PyPDF2
-        with open(pdf_path, 'rb') as pdf_file:
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
-            first_page = pdf_reader.pages[0]
-            pdf_width = float(first_page.mediabox.width)
-            pdf_height = float(first_page.mediabox.height)
-            num_pages = len(pdf_reader.pages)
-            logging.info(f"PDF has {num_pages} pages, dimensions: {pdf_width}x{pdf_height}")
+        # Reuse the caller's PyPDF2 pass when available
+        pdf_meta = pdf_meta or load_pdf_meta(pdf_path)
+        num_pages = pdf_meta.num_pages
+        logging.info(f"PDF has {num_pages} pages, dimensions: {pdf_meta.width}x{pdf_meta.height}")
 
-        all_tables = []
-
-        # Process each page
+        # Collect the pages to read along with their selected areas
+        pages = []
         for page_num in range(1, num_pages + 1):
-            logging.debug(f"Processing page {page_num}")
-
             page_areas = None
-            if selected_areas:
-                # Filter areas for current page
-                page_areas = [
-                    [
-                        area['y'] * 100,  # top
-                        area['x'] * 100,  # left
-                        (area['y'] + area['height']) * 100,  # bottom
-                        (area['x'] + area['width']) * 100  # right
-                    ]
-                    for area in selected_areas if area.get('page', 1) == page_num
-                ]
+            if areas_by_page:
+                page_areas = areas_by_page.get(page_num)
                 if not page_areas:
-                    logging.debug(f"No selected areas for page {page_num}")
-                    continue
-                logging.debug(f"Found areas for page {page_num}: {page_areas}")
-
-            # Try extraction methods
-            methods = [
-                {'lattice': True, 'stream': False},
-                {'lattice': False, 'stream': True},
-                {'lattice': True, 'stream': True}
-            ]
-
-            page_tables = []
-            for method in methods:
-                try:
-                    logging.debug(f"Trying extraction with method: {method}")
-                    tables = tabula.read_pdf(
-                        pdf_path,
-                        pages=str(page_num),
-                        multiple_tables=True,
-                        guess=True,
-                        area=page_areas[0] if page_areas else None,
-                        relative_area=False if page_areas else True,
-                        lattice=method['lattice'],
-                        stream=method['stream'],
-                        pandas_options={'header': None},
-                        java_options=java_options
-                    )
-
-                    if tables:
-                        logging.debug(f"Found {len(tables)} tables with method {method}")
-                        page_tables.extend(tables)
-
-                except Exception as e:
-                    logging.error(f"Error with method {method}: {str(e)}")
+                    logging.debug("No selected areas for page %s", page_num)
                     continue
+                logging.debug("Found areas for page %s: %s", page_num, page_areas)
+            pages.append((page_num, page_areas))
+
+        # Pages are read one after another on the shared JVM. Threads would race on the
+        # command-line parser tabula-py's in-process backend reuses for every call, and worker
+        # processes each start their own interpreter and JVM, which costs more than they save
+        # on statement-sized documents
+        results = [
+            _extract_page_tables(pdf_path, page_num, page_areas)
+            for page_num, page_areas in pages
+        ]
 
-            if page_tables:
-                # Add page information to tables
-                for table in page_tables:
-                    table.attrs = {'page_number': page_num}
-                    logging.debug(f"Table shape: {table.shape}")
-                    logging.debug(f"Table preview:\n{table.head()}")
-                all_tables.extend(page_tables)
+        all_tables = []
+        for (page_num, _), page_tables in zip(pages, results):
+            # Add page information to tables
+            for table in page_tables:
+                table.attrs = {'page_number': page_num}
+                logging.debug("Table shape: %s", table.shape)
+                if logging.getLogger().isEnabledFor(logging.DEBUG):
+                    logging.debug("Table preview:\n%s", table.head())
+            all_tables.extend(page_tables)
 
         if not all_tables:
             logging.error("No tables could be extracted from any page")
@@ -557,14 +494,28 @@ def convert_pdf_to_data(pdf_path: str, selected_areas=None):
 
         if not all_transactions:
             logging.warning("No transactions found in selected areas, trying full page extraction")
-            # Fallback to original table extraction method
-            tables = extract_tables_from_pdf(pdf_path, selected_areas)
-            if tables:
-                for table in tables:
-                    if len(table.columns) >= 4:
-                        table.columns = range(len(table.columns))
-                        transactions = process_transaction_rows(table, 1)
-                        all_transactions.extend([t for t in transactions if is_valid_transaction(t)])
+            pdf_meta = load_pdf_meta(pdf_path)
+            areas_by_page = group_areas_by_page(selected_areas)
+
+            # Scanned statements have no text layer for tabula to find, so OCR them instead
+            if pdf_meta.leading_text_length < IMAGE_PDF_TEXT_THRESHOLD:
+                all_transactions = process_image_based_pdf(pdf_path, areas_by_page)
+                if not all_transactions:
+                    logging.warning("No transactions found with OCR, trying table extraction")
+
+            if not all_transactions:
+                # Fallback to original table extraction method
+                tables = extract_tables_from_pdf(pdf_path, areas_by_page, pdf_meta=pdf_meta)
+                if tables:
+                    frames = []
+                    for table in tables:
+                        if len(table.columns) >= 4:
+                            frames.append(transaction_rows_frame(table, table.attrs.get('page_number', 1)))
+
+                    # Validate all extracted rows in one pass
+                    if frames:
+                        transactions = pd.concat(frames, ignore_index=True)
+                        all_transactions = transactions[valid_transaction_mask(transactions)].to_dict('records')
 
         if not all_transactions:
             logging.error("No valid transactions could be extracted")
@@ -586,42 +537,76 @@ def convert_pdf(pdf_path: str, output_format: str = 'excel', selected_areas=None
         if not processed_data:
             return None
 
-        # Convert to DataFrame
-        df = pd.DataFrame(processed_data)
-
         # Create output file
         temp_file = tempfile.NamedTemporaryFile(delete=False)
 
         if output_format == 'excel':
             output_path = f"{temp_file.name}.xlsx"
-            with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-                df.to_excel(writer, index=False, sheet_name='Transactions')
-                workbook = writer.book
-                worksheet = writer.sheets['Transactions']
-
-                # Format headers
-                header_font = Font(bold=True)
-                header_fill = PatternFill(start_color='D3D3D3', end_color='D3D3D3', fill_type='solid')
-                header_alignment = Alignment(horizontal='center')
-
-                for col in range(len(df.columns)):
-                    cell = worksheet.cell(row=1, column=col+1)
-                    cell.font = header_font
-                    cell.fill = header_fill
-                    cell.alignment = header_alignment
-
-                # Adjust column widths
-                for idx, column in enumerate(worksheet.columns, 1):
-                    max_length = max(len(str(cell.value)) for cell in column)
-                    adjusted_width = (max_length + 2)
-                    worksheet.column_dimensions[get_column_letter(idx)].width = adjusted_width
-
-                # Set wrap text for transaction details
-                for cell in worksheet['B']:
-                    cell.alignment = Alignment(wrapText=True)
+
+            # Convert to DataFrame with a fixed column layout, built column by column
+            df = pd.DataFrame({
+                column: [transaction.get(column, '') for transaction in processed_data]
+                for column in TRANSACTION_COLUMNS
+            })
+
+            workbook = Workbook(write_only=True)
+            worksheet = workbook.create_sheet('Transactions')
+
+            # Adjust column widths from the data (must precede any appended rows)
+            for idx, column in enumerate(df.columns, 1):
+                max_length = max(len(column), df[column].astype(str).str.len().max())
+                worksheet.column_dimensions[get_column_letter(idx)].width = max_length + 2
+
+            # Format headers
+            header_font = Font(bold=True)
+            header_fill = PatternFill(start_color='D3D3D3', end_color='D3D3D3', fill_type='solid')
+            header_alignment = Alignment(horizontal='center')
+
+            header = []
+            for column in df.columns:
+                cell = WriteOnlyCell(worksheet, value=column)
+                cell.font = header_font
+                cell.fill = header_fill
+                cell.alignment = header_alignment
+                header.append(cell)
+            worksheet.append(header)
+
+            # Amounts are written as numbers; values that aren't numeric are left blank
+            sheet_df = df.copy()
+            for column in AMOUNT_COLUMNS:
+                sheet_df[column] = pd.to_numeric(df[column], errors='coerce')
+
+            # Shared named styles for wrapped details and two-decimal amounts
+            workbook.add_named_style(NamedStyle(name='Wrapped', alignment=Alignment(wrap_text=True)))
+            workbook.add_named_style(NamedStyle(name='Amount', number_format='0.00'))
+            details_idx = df.columns.get_loc('Transaction Details')
+            amount_idxs = [df.columns.get_loc(column) for column in AMOUNT_COLUMNS]
+
+            rows = sheet_df.astype(object)
+            rows = rows.where(rows.notna() & rows.ne(''), None)
+            for row in rows.itertuples(index=False, name=None):
+                row = list(row)
+                details = WriteOnlyCell(worksheet, value=row[details_idx])
+                details.style = 'Wrapped'
+                row[details_idx] = details
+                for idx in amount_idxs:
+                    if row[idx] is not None:
+                        amount = WriteOnlyCell(worksheet, value=row[idx])
+                        amount.style = 'Amount'
+                        row[idx] = amount
+                worksheet.append(row)
+
+            workbook.save(output_path)
         else:
             output_path = f"{temp_file.name}.csv"
-            df.to_csv(output_path, index=False)
+            # Stream the records straight to disk, no DataFrame needed, in 64 KiB writes
+            with open(output_path, 'w', newline='', encoding='utf-8', buffering=CSV_BUFFER_SIZE) as csv_file:
+                writer = csv.DictWriter(
+                    csv_file, fieldnames=TRANSACTION_COLUMNS, restval='',
+                    extrasaction='ignore', lineterminator='\n'
+                )
+                writer.writeheader()
+                writer.writerows(processed_data)
 
         logging.info(f"Successfully created output file: {output_path}")
         return output_path
@@ -1,54 +1,105 @@
 import logging
 import os
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
 from typing import List, Dict, Optional, Tuple
 import pytesseract
 from pdf2image import convert_from_path
-from PIL import Image, ImageEnhance, ImageFilter
+from PIL import Image, ImageEnhance, ImageFilter, ImageStat
 import numpy as np
+import pandas as pd
 import re
-import PyPDF2
 from datetime import datetime
 
 logging.basicConfig(level=logging.DEBUG)
 
-def is_image_based_pdf(pdf_path: str) -> bool:
-    """
-    Determine if a PDF is image-based by comparing text extraction methods.
-    Returns True if the PDF is primarily image-based, False if it's text-based.
-    """
-    try:
-        logging.debug(f"Checking if PDF is image-based: {pdf_path}")
-
-        # First try direct text extraction
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            direct_text = ''
-            for page in pdf_reader.pages[:2]:  # Check first two pages
-                direct_text += page.extract_text()
-
-            logging.debug(f"Direct text extraction length: {len(direct_text.strip())}")
-
-        # Try OCR on first page
-        images = convert_from_path(pdf_path, first_page=1, last_page=1)
-        if not images:
-            return False
-
-        # Get text from image using OCR
-        ocr_text = pytesseract.image_to_string(images[0])
-        logging.debug(f"OCR text extraction length: {len(ocr_text.strip())}")
-
-        # If OCR gets text but direct extraction doesn't, it's image-based
-        if len(ocr_text.strip()) > 100 and len(direct_text.strip()) < 100:
-            logging.info("PDF appears to be image-based (OCR successful, direct extraction failed)")
-            return True
-
-        logging.info("PDF appears to be text-based")
-        return False
-
-    except Exception as e:
-        logging.error(f"Error detecting PDF type: {str(e)}")
-        return False
+# Pages are OCRed in parallel, so keep each tesseract process single-threaded
+os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+
+# Tesseract settings for statement tables: uniform text block, spacing kept
+OCR_CONFIG = r'--oem 3 --psm 6 -c preserve_interword_spaces=1'
+
+# Default page render DPI for OCR; pages whose words were read with a mean tesseract
+# confidence (0-100) below OCR_RETRY_CONFIDENCE at a lower DPI are re-read at OCR_RETRY_DPI
+OCR_DPI = 200
+OCR_RETRY_DPI = 300
+OCR_RETRY_CONFIDENCE = 60
+
+# With this many images to read, each worker OCRs its share of the pages in one batched
+# tesseract run rather than starting tesseract once per image
+BATCH_OCR_MIN_IMAGES = 10
+
+# Header/footer rows that are not transactions
+_SKIP_RE = re.compile(r'opening|closing|balance|total|brought|carried', re.IGNORECASE)
+
+# Dates such as "26 Apr" or "26/04/2024", matched at the start of a token
+_DATE_PATTERN = re.compile(
+    r'\d{1,2}\s*(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)'
+    r'|\d{1,2}[-/]\d{1,2}[-/]\d{2,4}',
+    re.IGNORECASE,
+)
+
+# Whole-token amounts: standard, parentheses and CR/DR suffix formats
+_AMOUNT_PATTERN = re.compile(
+    r'[\$]?\s*(?:'
+    r'-?\d+(?:,\d{3})*(?:\.\d{2})?'
+    r'|\(?\d+(?:,\d{3})*(?:\.\d{2})?\)?'
+    r'|\d+(?:,\d{3})*(?:\.\d{2})?\s*(?:CR|DR)?'
+    r')'
+)
+
+# Header words by column. Branches are tried in order and each matches its keyword
+# anywhere in the word, so a word naming two columns goes to the first, as before
+_HEADER_WORD_RE = re.compile(
+    r'(?P<date>.*DATE)'
+    r'|(?P<details>.*(?:TRANSACTION|DETAILS|DESCRIPTION))'
+    r'|(?P<withdrawals>.*(?:WITHDRAWAL|DEBIT|DR))'
+    r'|(?P<deposits>.*(?:DEPOSIT|CREDIT|CR))'
+    r'|(?P<balance>.*BALANCE)',
+    re.DOTALL,
+)
+
+# Commas, CR/DR markers and brackets that clean_amount strips from OCR amounts
+_AMOUNT_NOISE_RE = re.compile(r',|CR|DR')
+_PARENS_TABLE = str.maketrans('', '', '()')
+
+def header_image(image: Image.Image) -> Image.Image:
+    """Crop and enhance the top of a page, where the table header is expected"""
+    return preprocess_image(image.crop((0, 0, image.width, int(image.height * 0.2))))
+
+def image_to_data_batch(images: List[Image.Image]) -> List[Dict]:
+    """OCR several images in one tesseract run and split its word data per image"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # Tesseract reads a text file of image paths as one multi-page input
+        paths = []
+        for idx, image in enumerate(images):
+            path = os.path.join(tmpdir, f'{idx:05d}.png')
+            image.save(path)
+            paths.append(path)
+        list_path = os.path.join(tmpdir, 'images.txt')
+        with open(list_path, 'w') as list_file:
+            list_file.write('\n'.join(paths) + '\n')
+
+        data = pytesseract.image_to_data(list_path, output_type=pytesseract.Output.DICT, config=OCR_CONFIG)
+
+    # Every word row carries the 1-based number of the image it came from
+    per_image = [{key: [] for key in data} for _ in images]
+    for i, page_num in enumerate(data['page_num']):
+        image_data = per_image[int(page_num) - 1]
+        for key, values in data.items():
+            image_data[key].append(values[i])
+    return per_image
+
+def default_header_columns(width: int) -> Dict[str, Tuple[int, int]]:
+    """Fixed column positions, as fractions of the image width, for undetected headers"""
+    return {
+        'date': (0, int(width * 0.15)),
+        'details': (int(width * 0.15), int(width * 0.6)),
+        'withdrawals': (int(width * 0.6), int(width * 0.75)),
+        'deposits': (int(width * 0.75), int(width * 0.9)),
+        'balance': (int(width * 0.9), width)
+    }
 
 def find_table_header(image: Image.Image) -> Dict[str, Tuple[int, int]]:
     """
@@ -57,13 +108,10 @@ def find_table_header(image: Image.Image) -> Dict[str, Tuple[int, int]]:
     try:
         logging.debug("Attempting to find table header")
 
-        # Enhance image for header detection
-        header_image = image.crop((0, 0, image.width, int(image.height * 0.2)))
-        enhanced = preprocess_image(header_image)
-
         # Get OCR data for header
-        custom_config = r'--oem 3 --psm 6 -c preserve_interword_spaces=1'
-        header_data = pytesseract.image_to_data(enhanced, output_type=pytesseract.Output.DICT, config=custom_config)
+        header_data = pytesseract.image_to_data(
+            header_image(image), output_type=pytesseract.Output.DICT, config=OCR_CONFIG
+        )
 
         # Find header row
         header_columns = {}
@@ -77,19 +125,19 @@ def find_table_header(image: Image.Image) -> Dict[str, Tuple[int, int]]:
                 x_start = header_data['left'][i]
                 x_end = x_start + header_data['width'][i]
 
-                if 'DATE' in text:
-                    header_columns['date'] = (0, x_end + 20)
-                elif any(word in text for word in ['TRANSACTION', 'DETAILS', 'DESCRIPTION']):
-                    header_columns['details'] = (x_start - 20, x_end + 20)
-                elif any(word in text for word in ['WITHDRAWAL', 'DEBIT', 'DR']):
-                    header_columns['withdrawals'] = (x_start - 20, x_end + 20)
-                elif any(word in text for word in ['DEPOSIT', 'CREDIT', 'CR']):
-                    header_columns['deposits'] = (x_start - 20, x_end + 20)
-                elif 'BALANCE' in text:
-                    header_columns['balance'] = (x_start - 20, image.width)
+                match = _HEADER_WORD_RE.match(text)
+                if not match:
+                    continue
+                column = match.lastgroup
+                if column == 'date':
+                    header_columns[column] = (0, x_end + 20)
+                elif column == 'balance':
+                    header_columns[column] = (x_start - 20, image.width)
+                else:
+                    header_columns[column] = (x_start - 20, x_end + 20)
 
-        logging.debug(f"Found header texts: {header_texts}")
-        logging.debug(f"Detected header columns: {header_columns}")
+        logging.debug("Found header texts: %s", header_texts)
+        logging.debug("Detected header columns: %s", header_columns)
 
         # If balance column not found, use last section of the image
         if 'balance' not in header_columns and header_columns:
@@ -100,28 +148,14 @@ def find_table_header(image: Image.Image) -> Dict[str, Tuple[int, int]]:
         if not header_columns:
             logging.warning("Header detection failed, using default column positions")
             # Fallback to fixed positions
-            width = image.width
-            header_columns = {
-                'date': (0, int(width * 0.15)),
-                'details': (int(width * 0.15), int(width * 0.6)),
-                'withdrawals': (int(width * 0.6), int(width * 0.75)),
-                'deposits': (int(width * 0.75), int(width * 0.9)),
-                'balance': (int(width * 0.9), width)
-            }
+            header_columns = default_header_columns(image.width)
 
         return header_columns
 
     except Exception as e:
         logging.error(f"Error in header detection: {str(e)}")
         # Return default column positions
-        width = image.width
-        return {
-            'date': (0, int(width * 0.15)),
-            'details': (int(width * 0.15), int(width * 0.6)),
-            'withdrawals': (int(width * 0.6), int(width * 0.75)),
-            'deposits': (int(width * 0.75), int(width * 0.9)),
-            'balance': (int(width * 0.9), width)
-        }
+        return default_header_columns(image.width)
 
 def preprocess_image(image: Image.Image) -> Image.Image:
     """
@@ -131,9 +165,9 @@ def preprocess_image(image: Image.Image) -> Image.Image:
         # Convert to grayscale
         image = image.convert('L')
 
-        # Increase contrast
-        enhancer = ImageEnhance.Contrast(image)
-        image = enhancer.enhance(2.0)
+        # Increase contrast around the mean grey level with one lookup-table pass
+        mean = int(ImageStat.Stat(image).mean[0] + 0.5)
+        image = image.point([min(255, max(0, mean + 2 * (value - mean))) for value in range(256)])
 
         # Increase sharpness
         enhancer = ImageEnhance.Sharpness(image)
@@ -142,109 +176,77 @@ def preprocess_image(image: Image.Image) -> Image.Image:
         # Remove noise
         image = image.filter(ImageFilter.MedianFilter(size=3))
 
-        # Apply adaptive thresholding
-        np_image = np.array(image)
+        # Apply adaptive thresholding against the mean of each pixel's 25x25 neighbourhood
+        np_image = np.asarray(image)
         block_size = 25
         C = 5
-        mean = np_image.mean()
-        thresh = mean + C
-        binary = np_image > thresh
+        local_mean = np.asarray(image.filter(ImageFilter.BoxBlur(block_size // 2)), dtype=np.int16)
+        binary = np_image > local_mean - C
 
-        # Return processed image
-        processed = Image.fromarray((binary * 255).astype(np.uint8))
+        # Return a 1-bit image: tesseract receives it as a PNG temp file, which
+        # encodes faster and smaller than an 8-bit grey image of the same pixels
+        processed = Image.fromarray(binary)
         return processed
 
     except Exception as e:
         logging.error(f"Error in image preprocessing: {str(e)}")
         return image
 
-def extract_table_data(image: Image.Image) -> List[Dict]:
+def extract_table_data(image: Image.Image, header_columns: Optional[Dict[str, Tuple[int, int]]] = None,
+                       ocr_data: Optional[Dict] = None) -> Tuple[List[Dict], float]:
     """
-    Extract transaction data from image using OCR and positional analysis
+    Extract transaction data from image using OCR and positional analysis, along with the
+    mean OCR confidence of its words (NaN when no words were read)
     """
     try:
         logging.debug("Starting table data extraction")
 
-        # Find table structure
-        header_columns = find_table_header(image)
-
-        # Preprocess image
-        processed_image = preprocess_image(image)
-
-        # Configure OCR
-        custom_config = r'--oem 3 --psm 6 -c preserve_interword_spaces=1'
-        ocr_data = pytesseract.image_to_data(processed_image, output_type=pytesseract.Output.DICT, config=custom_config)
-
-        # Group text by lines
-        lines = []
-        current_line = []
-        current_y = -1
-        y_threshold = 10
-
-        for i in range(len(ocr_data['text'])):
-            text = ocr_data['text'][i].strip()
-            conf = int(ocr_data['conf'][i])
-            x_pos = ocr_data['left'][i]
-            y_pos = ocr_data['top'][i]
-
-            if conf < 40 or not text:  # Lowered confidence threshold
-                continue
-
-            # Start new line if y position changes significantly
-            if current_y == -1 or abs(y_pos - current_y) > y_threshold:
-                if current_line:
-                    lines.append(sorted(current_line, key=lambda x: x['x']))
-                current_line = []
-                current_y = y_pos
-
-            current_line.append({
-                'text': text,
-                'x': x_pos,
-                'y': y_pos,
-                'width': ocr_data['width'][i]
-            })
-
-        if current_line:
-            lines.append(sorted(current_line, key=lambda x: x['x']))
+        # Find table structure unless the caller already has it
+        if header_columns is None:
+            header_columns = find_table_header(image)
+
+        # OCR the preprocessed image unless it was read in a batch
+        if ocr_data is None:
+            processed_image = preprocess_image(image)
+            ocr_data = pytesseract.image_to_data(processed_image, output_type=pytesseract.Output.DICT, config=OCR_CONFIG)
+
+        # Keep confident, non-empty words, in reading order within each OCR line
+        words = pd.DataFrame(ocr_data)
+        words['text'] = words['text'].astype(str).str.strip()
+        conf = pd.to_numeric(words['conf'], errors='coerce')
+        # Tesseract reports -1 for layout rows that hold no word
+        confidence = conf[(conf >= 0) & (words['text'] != '')].mean()
+        words = words[(conf >= 40) & (words['text'] != '')]
+        words = words.sort_values(['block_num', 'par_num', 'line_num', 'left'], kind='stable')
+        line_ids = words.groupby(['block_num', 'par_num', 'line_num'], sort=False).ngroup()
+        text = words['text']
+
+        # Classify each word based on position; the last match in a line wins
+        lines = pd.DataFrame(index=pd.RangeIndex(line_ids.max() + 1 if len(words) else 0))
+        for col_name, (start, end) in header_columns.items():
+            in_column = words['left'].between(start, end)
+            if col_name == 'date':
+                found = in_column & text.str.match(_DATE_PATTERN)
+                lines[col_name] = text[found].groupby(line_ids[found]).last()
+            elif col_name == 'details':
+                lines[col_name] = text[in_column].groupby(line_ids[in_column]).agg(' '.join)
+            else:
+                found = in_column & text.str.fullmatch(_AMOUNT_PATTERN)
+                lines[col_name] = text[found].groupby(line_ids[found]).last().map(clean_amount)
+        lines = lines.reindex(columns=['date', 'details', 'withdrawals', 'deposits', 'balance']).fillna('')
+        logging.debug("Grouped %s words into %s lines", len(words), len(lines))
 
         # Process lines into transactions
         transactions = []
         current_transaction = None
 
-        for line in lines:
-            line_data = {
-                'date': '',
-                'details': [],
-                'withdrawals': '',
-                'deposits': '',
-                'balance': ''
-            }
-
-            # Classify each word based on position
-            for word in line:
-                x_pos = word['x']
-                text = word['text']
-
-                for col_name, (start, end) in header_columns.items():
-                    if start <= x_pos <= end:
-                        if col_name == 'date' and is_date(text):
-                            line_data['date'] = text
-                            logging.debug(f"Found date: {text}")
-                        elif col_name == 'details':
-                            line_data['details'].append(text)
-                        elif col_name in ['withdrawals', 'deposits', 'balance'] and is_amount(text):
-                            line_data[col_name] = clean_amount(text)
-                            logging.debug(f"Found {col_name}: {text}")
-
-            # Join details
-            line_data['details'] = ' '.join(line_data['details'])
-
+        for line_data in lines.to_dict('records'):
             # Handle transaction continuation
             if line_data['date']:  # New transaction
                 if current_transaction:
                     if is_valid_transaction(current_transaction):
                         transactions.append(current_transaction)
-                        logging.debug(f"Added transaction: {current_transaction}")
+                        logging.debug("Added transaction: %s", current_transaction)
                 current_transaction = {
                     'Date': line_data['date'],
                     'Transaction Details': line_data['details'],
@@ -266,50 +268,27 @@ def extract_table_data(image: Image.Image) -> List[Dict]:
             transactions.append(current_transaction)
 
         logging.info(f"Extracted {len(transactions)} valid transactions")
-        return transactions
+        return transactions, confidence
 
     except Exception as e:
         logging.error(f"Error in table extraction: {str(e)}")
-        return []
-
-def is_date(text: str) -> bool:
-    """Check if text matches date patterns"""
-    date_patterns = [
-        r'\d{1,2}\s*(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)',
-        r'\d{1,2}[-/]\d{1,2}[-/]\d{2,4}'
-    ]
-    text = text.strip().upper()
-    return any(re.match(pattern, text, re.IGNORECASE) for pattern in date_patterns)
-
-def is_amount(text: str) -> bool:
-    """Check if text matches amount patterns"""
-    # More flexible amount pattern matching
-    amount_patterns = [
-        r'^[\$]?\s*-?\d+(?:,\d{3})*(?:\.\d{2})?$',  # Standard format
-        r'^[\$]?\s*\(?\d+(?:,\d{3})*(?:\.\d{2})?\)?$',  # Parentheses format
-        r'^[\$]?\s*\d+(?:,\d{3})*(?:\.\d{2})?\s*(?:CR|DR)?$'  # With CR/DR suffix
-    ]
-    text = text.strip()
-    return any(re.match(pattern, text) for pattern in amount_patterns)
+        return [], np.nan
 
 def clean_amount(amount_str: str) -> str:
     """Clean and format amount strings"""
     try:
         if not amount_str:
             return ''
-        # Remove currency symbols and cleanup
-        amount_str = str(amount_str).replace('$', '').strip()
+        # Remove currency symbols
+        amount_str = str(amount_str).replace('$', '').upper()
 
-        # Handle CR/DR suffix
-        is_credit = 'CR' in amount_str.upper()
-        amount_str = amount_str.upper().replace('CR', '').replace('DR', '').strip()
-
-        # Remove commas
-        amount_str = amount_str.replace(',', '')
+        # Handle CR/DR suffix; commas and the markers go in one pass
+        is_credit = 'CR' in amount_str
+        amount_str = _AMOUNT_NOISE_RE.sub('', amount_str).strip()
 
         # Handle bracketed negative numbers
         if '(' in amount_str and ')' in amount_str:
-            amount_str = '-' + amount_str.replace('(', '').replace(')', '')
+            amount_str = '-' + amount_str.translate(_PARENS_TABLE)
 
         # Convert to float to validate and format
         try:
@@ -331,69 +310,218 @@ def is_valid_transaction(transaction: Dict) -> bool:
             return False
 
         # Must have some details or amounts
-        has_content = any([
-            transaction['Transaction Details'],
-            transaction['Withdrawals ($)'],
-            transaction['Deposits ($)'],
+        details = transaction['Transaction Details']
+        has_content = (
+            details or
+            transaction['Withdrawals ($)'] or
+            transaction['Deposits ($)'] or
             transaction['Balance ($)']
-        ])
+        )
         if not has_content:
             return False
 
         # Skip header/footer rows
-        skip_words = ['opening', 'closing', 'balance', 'total', 'brought', 'carried']
-        details_lower = transaction['Transaction Details'].lower()
-        if any(word in details_lower for word in skip_words):
+        if _SKIP_RE.search(details):
             return False
 
         return True
     except Exception:
         return False
 
-def process_image_based_pdf(pdf_path: str, selected_areas=None) -> List[Dict]:
+def page_regions(image: Image.Image, page_areas=None) -> List[Image.Image]:
+    """Crop a page image to its selected areas, or return the whole page"""
+    if not page_areas:
+        return [image]
+
+    regions = []
+    for top, left, bottom, right in page_areas:
+        # Areas are [top, left, bottom, right] percentages of the page, as tabula takes them
+        box = (
+            int(left / 100 * image.width),
+            int(top / 100 * image.height),
+            int(right / 100 * image.width),
+            int(bottom / 100 * image.height),
+        )
+
+        # Crop the image to the selected area
+        regions.append(image.crop(box))
+    return regions
+
+def region_header_columns(region: Image.Image, header_columns=None) -> Dict[str, Tuple[int, int]]:
+    """Reuse column positions detected on an earlier page when they fit the region, else detect them"""
+    # Detected and default layouts alike end at the width of the image they were found on;
+    # a default layout means the earlier header was not read, so this region gets its own try
+    if (header_columns is not None
+            and header_columns['balance'][1] == region.width
+            and header_columns != default_header_columns(region.width)):
+        return header_columns
+    return find_table_header(region)
+
+def page_header_columns(image: Image.Image, page_areas=None) -> List[Dict[str, Tuple[int, int]]]:
+    """Detect the table columns of each region of a page"""
+    return [find_table_header(region) for region in page_regions(image, page_areas)]
+
+def extract_page_transactions(page_num: int, image: Image.Image, page_areas=None,
+                              header_columns=None) -> Tuple[List[Dict], float]:
+    """
+    Extract transactions from one page image, or from its selected areas, along with the
+    lowest mean OCR confidence of its regions (NaN when no words were read)
     """
-    Process an image-based PDF and extract transaction data.
+    logging.debug("Processing page %s", page_num)
+
+    regions = page_regions(image, page_areas)
+    page_transactions = []
+    confidences = []
+    for region, columns in zip(regions, header_columns or [None] * len(regions)):
+        region_transactions, confidence = extract_table_data(region, region_header_columns(region, columns))
+        page_transactions.extend(region_transactions)
+        if not np.isnan(confidence):
+            confidences.append(confidence)
+
+    logging.debug("Extracted %s transactions from page %s", len(page_transactions), page_num)
+    return page_transactions, min(confidences, default=np.nan)
+
+def retry_page_transactions(pdf_path: str, dpi: int, page_num: int, page_areas,
+                            page_transactions: List[Dict], confidence: float) -> List[Dict]:
+    """Re-read a page at OCR_RETRY_DPI if it was read with low confidence at a lower DPI"""
+    # Pages without words (blank or pictures) and clearly read pages are kept as they are
+    if not (confidence < OCR_RETRY_CONFIDENCE and dpi < OCR_RETRY_DPI):
+        return page_transactions
+
+    logging.debug("Retrying page %s (confidence %.0f) at %s DPI", page_num, confidence, OCR_RETRY_DPI)
+    retry_images = convert_from_path(
+        pdf_path, dpi=OCR_RETRY_DPI, grayscale=True, first_page=page_num, last_page=page_num
+    )
+    if retry_images:
+        with retry_images[0] as image:
+            retry_transactions, retry_confidence = extract_page_transactions(page_num, image, page_areas)
+        # Keep whichever reading of the page tesseract was surer of
+        if retry_confidence > confidence:
+            return retry_transactions
+    return page_transactions
+
+def extract_page_file_transactions(pdf_path: str, dpi: int, page_num: int, page_path: str,
+                                   page_areas=None, header_columns=None) -> List[Dict]:
+    """
+    Load one page rendered at the given DPI from disk, extract its transactions and delete
+    the file; a page read with low confidence is retried from the PDF at OCR_RETRY_DPI
+    """
+    with Image.open(page_path) as image:
+        page_transactions, confidence = extract_page_transactions(page_num, image, page_areas, header_columns)
+    # The temporary directory may be memory-backed, so read pages do not wait for cleanup
+    os.remove(page_path)
+    return retry_page_transactions(pdf_path, dpi, page_num, page_areas, page_transactions, confidence)
+
+def extract_pages_batched(pdf_path: str, dpi: int, page_nums: List[int], page_paths: List[str],
+                          page_areas: List, header_columns: List) -> List[List[Dict]]:
+    """Extract transactions from several rendered pages with one tesseract run over all their regions"""
+    # Only the column layouts and binarized regions are kept; each page is released and
+    # its file deleted once they are made
+    region_columns, region_images, region_pages = [], [], []
+    for page_idx, (page_path, areas, columns_list) in enumerate(zip(page_paths, page_areas, header_columns)):
+        with Image.open(page_path) as image:
+            regions = page_regions(image, areas)
+            for region, columns in zip(regions, columns_list or [None] * len(regions)):
+                region_columns.append(region_header_columns(region, columns))
+                region_images.append(preprocess_image(region))
+                region_pages.append(page_idx)
+        os.remove(page_path)
+
+    ocr_data = image_to_data_batch(region_images)
+
+    page_transactions = [[] for _ in page_paths]
+    page_confidences = [[] for _ in page_paths]
+    for page_idx, region, columns, region_data in zip(region_pages, region_images, region_columns, ocr_data):
+        region_transactions, confidence = extract_table_data(region, columns, region_data)
+        page_transactions[page_idx].extend(region_transactions)
+        if not np.isnan(confidence):
+            page_confidences[page_idx].append(confidence)
+
+    # Pages read with low confidence are retried in this worker, alongside the other shares
+    page_results = []
+    for page_num, areas, transactions, confidences in zip(page_nums, page_areas, page_transactions, page_confidences):
+        logging.debug("Extracted %s transactions from page %s", len(transactions), page_num)
+        page_results.append(retry_page_transactions(
+            pdf_path, dpi, page_num, areas, transactions, min(confidences, default=np.nan)
+        ))
+    return page_results
+
+def process_image_based_pdf(pdf_path: str, areas_by_page=None, dpi: int = OCR_DPI) -> List[Dict]:
+    """
+    Process an image-based PDF and extract transaction data, rendering pages at the given DPI.
+    With areas_by_page (page number to [top, left, bottom, right] percentages), only those
+    areas of those pages are read.
     """
     try:
         logging.info(f"Processing image-based PDF: {pdf_path}")
 
-        # Convert PDF pages to images with higher DPI for better quality
-        images = convert_from_path(pdf_path, dpi=300)
-        if not images:
-            logging.error("Failed to convert PDF to images")
-            return []
-
-        all_transactions = []
-        for page_num, image in enumerate(images, 1):
-            logging.debug(f"Processing page {page_num}")
-
-            if selected_areas:
-                # Process only selected areas
-                for area in selected_areas:
-                    # Calculate pixel coordinates
-                    x = int(area['x'] * image.width)
-                    y = int(area['y'] * image.height)
-                    width = int(area['width'] * image.width)
-                    height = int(area['height'] * image.height)
-
-                    # Crop the image to the selected area
-                    cropped_image = image.crop((x, y, x + width, y + height))
-
-                    # Extract transactions from the cropped area
-                    transactions = extract_table_data(cropped_image)
-
-                    if transactions:
-                        all_transactions.extend(transactions)
-                        logging.debug(f"Extracted {len(transactions)} transactions from selected area on page {page_num}")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            # Convert PDF pages to images; statements read fine at the lower DPI once binarized.
+            # OCR only needs grey levels, so poppler renders one channel, not three. Pages are
+            # left on disk and loaded one at a time, so memory holds only the pages being read
+            workers = os.cpu_count() or 1
+            page_paths = convert_from_path(
+                pdf_path, dpi=dpi, grayscale=True, thread_count=workers,
+                output_folder=tmpdir, paths_only=True
+            )
+            if not page_paths:
+                logging.error("Failed to convert PDF to images")
+                return []
+
+            # With selected areas, only the pages that have some are read
+            page_nums, page_areas = [], []
+            for page_num in range(1, len(page_paths) + 1):
+                if areas_by_page and not areas_by_page.get(page_num):
+                    logging.debug("No selected areas for page %s", page_num)
+                    continue
+                page_nums.append(page_num)
+                page_areas.append(areas_by_page.get(page_num) if areas_by_page else None)
+            if not page_nums:
+                logging.error("No selected areas on any page of the PDF")
+                return []
+            page_paths = [page_paths[page_num - 1] for page_num in page_nums]
+
+            # Statements repeat the table header on every page, so read it from the first
+            # page once and share it with pages that have the same areas; pages whose size
+            # differs still detect their own
+            with Image.open(page_paths[0]) as first_page:
+                first_columns = page_header_columns(first_page, page_areas[0])
+            header_columns = [first_columns if areas == page_areas[0] else None for areas in page_areas]
+
+            num_images = sum(len(areas or [None]) for areas in page_areas)
+            if num_images >= BATCH_OCR_MIN_IMAGES:
+                # Long documents: split the pages into one contiguous share per worker, each
+                # read in a single tesseract run, so processes start once per share, not per image
+                shares = min(len(page_paths), workers)
+                size = -(-len(page_paths) // shares)
+                chunks = [slice(start, start + size) for start in range(0, len(page_paths), size)]
+                logging.debug("OCR of %s pages in %s batched tesseract runs", len(page_paths), len(chunks))
+                with ThreadPoolExecutor(max_workers=len(chunks)) as executor:
+                    chunk_results = executor.map(
+                        extract_pages_batched, repeat(pdf_path), repeat(dpi),
+                        [page_nums[chunk] for chunk in chunks],
+                        [page_paths[chunk] for chunk in chunks],
+                        [page_areas[chunk] for chunk in chunks],
+                        [header_columns[chunk] for chunk in chunks],
+                    )
+                    page_results = [result for results in chunk_results for result in results]
+            elif len(page_paths) > 1 and workers > 1:
+                # Each OCR call runs in its own tesseract process, so pages can be read
+                # concurrently from threads without pickling the page images
+                with ThreadPoolExecutor(max_workers=min(len(page_paths), workers)) as executor:
+                    page_results = list(executor.map(
+                        extract_page_file_transactions, repeat(pdf_path), repeat(dpi),
+                        page_nums, page_paths, page_areas, header_columns
+                    ))
             else:
-                # Process the entire page
-                transactions = extract_table_data(image)
+                page_results = [
+                    extract_page_file_transactions(pdf_path, dpi, page_num, page_path, areas, columns)
+                    for page_num, page_path, areas, columns in zip(page_nums, page_paths, page_areas, header_columns)
+                ]
 
-                if transactions:
-                    all_transactions.extend(transactions)
-                    logging.debug(f"Extracted {len(transactions)} transactions from page {page_num}")
-                else:
-                    logging.warning(f"No transactions found on page {page_num}")
+        all_transactions = [
+            transaction for page_transactions in page_results for transaction in page_transactions
+        ]
 
         if not all_transactions:
             logging.error("No transactions could be extracted from any page")
@@ -404,4 +532,4 @@ def process_image_based_pdf(pdf_path: str, selected_areas=None) -> List[Dict]:
 
     except Exception as e:
         logging.error(f"Error processing image-based PDF: {str(e)}")
-        return []
\ No newline at end of file
+        return []